@@ -49,9 +49,36 @@ def test_lint(session: nox.Session) -> None:
 # https://github.com/pytest-dev/pytest-cov/issues/388
 
 
+WHEEL_DIR = Path(".nox") / "dist"
+
+
+@nox.session
+def _build_wheel(session: nox.Session) -> None:
+    """Build one wheel shared by all `tests` sessions, so that pip doesn't
+    re-walk and re-build the source tree once per Python version"""
+    session.install("build")
+    # drop wheels left over from previous runs, so the glob in `tests`
+    # can't pick a stale one after e.g. a version bump
+    shutil.rmtree(WHEEL_DIR, ignore_errors=True)
+    session.run("python", "-m", "build", "--wheel", "-o", str(WHEEL_DIR))
+
+
 @nox.session(python=PYTHON_VERSIONS)
 def tests(session: nox.Session) -> None:
-    session.install("-e", ".[tests,topwrap-parse]")
+    # installing from the shared wheel is opt-in (set by `tests_in_env`),
+    # so that a direct `nox -s tests` always tests the current working tree
+    wheel = None
+    if os.environ.get("TOPWRAP_USE_PREBUILT_WHEEL") == "1":
+        wheel = next(WHEEL_DIR.glob("topwrap-*.whl"), None)
+
+    pytest_opts = []
+    if wheel is not None:
+        session.install(f"{wheel}[tests,topwrap-parse]")
+        # like in _install_test, coverage of a non-editable install needs
+        # the append import mode
+        pytest_opts.append("--import-mode=append")
+    else:
+        session.install("-e", ".[tests,topwrap-parse]")
     session.run(
         "pytest",
         "-rs",
@@ -59,6 +86,7 @@ def tests(session: nox.Session) -> None:
         "html:cov_html",
         "--cov=topwrap",
         "--cov-config=pyproject.toml",
+        *pytest_opts,
         "tests",
     )
 
@@ -93,16 +121,53 @@ def prepare_pyenv(session: nox.Session, python_versions: List[str]) -> Dict[str,
             "\nSee https://github.com/pyenv/pyenv?tab=readme-ov-file#installation for more information"
         )
 
+    # A marker file records which versions a previous run found, so repeated
+    # sessions can skip the whole discovery below as long as neither the
+    # shims directory nor the global version selection has changed since.
+    # The global selection matters because `pyenv global` (run here or by
+    # the user) rewrites $PYENV_ROOT/version without touching the shims dir,
+    # yet decides which interpreters the shims dispatch to
+    marker_path = Path(env["PYENV_ROOT"]) / ".topwrap_shim_index.json"
+    version_file = Path(env["PYENV_ROOT"]) / "version"
+
+    def global_versions() -> str:
+        try:
+            return version_file.read_text()
+        except OSError:
+            return ""
+
+    try:
+        marker = json.loads(marker_path.read_text())
+        if (
+            set(python_versions) <= set(marker["versions"])
+            and marker["mtime"] == os.stat(pyenv_shims).st_mtime
+            and marker["global"] == global_versions()
+        ):
+            return env
+    except (OSError, ValueError, KeyError):
+        pass
+
+    # A single listing of the pyenv shims directory replaces one PATH-wide
+    # shutil.which() scan per version; which() stays as a fallback for
+    # interpreters installed outside of pyenv
+    def pyenv_shim_names() -> set:
+        return set(os.listdir(pyenv_shims)) if os.path.isdir(pyenv_shims) else set()
+
     # Install required Python versions if these don't exist
+    shims = pyenv_shim_names()
+    installed_any = False
     for ver in python_versions:
-        if not shutil.which(f"python{ver}", path=path):
+        if f"python{ver}" not in shims and not shutil.which(f"python{ver}", path=path):
             session.log(f"Installing Python {ver}")
             session.run("pyenv", "install", ver, external=True, env=env)
+            installed_any = True
+    if installed_any:
+        shims = pyenv_shim_names()
 
     # Detect which versions are provided by Pyenv
     pythons_in_pyenv = []
     for ver in python_versions:
-        if shutil.which(f"python{ver}", path=pyenv_shims):
+        if f"python{ver}" in shims:
             pythons_in_pyenv += [ver]
 
     # Allow using Pythons from Pyenv
@@ -110,6 +175,17 @@ def prepare_pyenv(session: nox.Session, python_versions: List[str]) -> Dict[str,
         session.log(f"Configuring Pythons from Pyenv, versions: {pythons_in_pyenv}")
         session.run("pyenv", "global", *pythons_in_pyenv, external=True, env=env)
 
+    if set(python_versions) <= set(pythons_in_pyenv):
+        marker_path.write_text(
+            json.dumps(
+                {
+                    "versions": pythons_in_pyenv,
+                    "mtime": os.stat(pyenv_shims).st_mtime,
+                    "global": global_versions(),
+                }
+            )
+        )
+
     return env
 
 
@@ -117,6 +193,8 @@ def prepare_pyenv(session: nox.Session, python_versions: List[str]) -> Dict[str,
 def tests_in_env(session: nox.Session) -> None:
     python_versions = PYTHON_VERSIONS if not session.posargs else session.posargs
     env = prepare_pyenv(session, python_versions)
+    session.run("nox", "-s", "_build_wheel", external=True, env=env)
+    env["TOPWRAP_USE_PREBUILT_WHEEL"] = "1"
     session.run("nox", "-s", "tests", "-p", *python_versions, external=True, env=env)
 
 
@@ -202,6 +280,18 @@ def pyright_check(session: nox.Session) -> None:
         session.run("nox", "-s", "_pyright_check")
 
 
+def _iter_pyright_diagnostics(f):
+    """Yield diagnostics from a pyright --outputjson report, streaming with
+    ijson when available so that large reports aren't materialized in memory
+    """
+    try:
+        import ijson
+    except ImportError:
+        yield from json.load(f)["generalDiagnostics"]
+        return
+    yield from ijson.items(f, "generalDiagnostics.item")
+
+
 @nox.session
 def _pyright_check(session: nox.Session) -> None:
     # this is not supposed to be called outright, use `pyright_check`
@@ -215,8 +305,7 @@ def _pyright_check(session: nox.Session) -> None:
         with TemporaryFile() as f:
             session.run("pyright", "--outputjson", stdout=f, success_codes=[0, 1], external=True)
             f.seek(0)
-            errors_data = json.load(f)
-            for errno in errors_data["generalDiagnostics"]:
+            for errno in _iter_pyright_diagnostics(f):
                 errortypes[errno["rule"]] += 1
                 errorfiles[str(Path(errno["file"]).relative_to(Path(".").resolve()))] += 1
         return (errortypes, errorfiles)
@@ -229,17 +318,22 @@ def _pyright_check(session: nox.Session) -> None:
         # save location of used config
         pyproject_origin = Path(os.getcwd(), "pyproject.toml")
 
-        with TemporaryDirectory() as dir:
-            # copy into temp dir and go into it
-            shutil.copytree(Path("."), dir, dirs_exist_ok=True)
-            with session.chdir(Path(dir)):
-                # switch to main and replace pyproject
-                session.run("git", "switch", "main", "--force", external=True)
-                session.run("rm", "pyproject.toml", external=True)
-                shutil.copy(pyproject_origin, dir)
-
-                # counting down errors on main
-                errortypes_main, errorfiles_main = count_down_errors()
+        with TemporaryDirectory() as tmpdir:
+            # check out main as a worktree instead of copying the whole
+            # working tree - it shares the object store with this repo,
+            # so no per-file copy happens
+            dir = str(Path(tmpdir) / "main")
+            session.run("git", "worktree", "add", "--detach", dir, "main", external=True)
+            try:
+                with session.chdir(Path(dir)):
+                    # replace pyproject with the one from this branch
+                    session.run("rm", "pyproject.toml", external=True)
+                    shutil.copy(pyproject_origin, dir)
+
+                    # counting down errors on main
+                    errortypes_main, errorfiles_main = count_down_errors()
+            finally:
+                session.run("git", "worktree", "remove", "--force", dir, external=True)
 
         for type in errortypes_main:
             if type not in errortypes:
@@ -12,14 +12,48 @@ from topwrap.util import JsonType
 
 from .common import read_json_file
 
+_PWM_YAMLS_PREFIX = "examples/pwm/ipcores/"
+_HDMI_YAMLS_PREFIX = "examples/hdmi/ipcores/"
+_AXI_YAMLS_PREFIX = "topwrap/ips/axi/"
+_HIERARCHY_YAMLS_PREFIX = "examples/hierarchy/repo/cores/"
+
+# built once at import time - the *_data() functions below only copy these
+# tuples instead of re-concatenating the paths on every call
+_PWM_IPCORES_YAMLS = (
+    "topwrap/ips/axi/axi_axil_adapter.yaml",
+    _PWM_YAMLS_PREFIX + "ps7.yaml",
+    _PWM_YAMLS_PREFIX + "litex_pwm.yml",
+)
+
+_HDMI_IPCORES_YAMLS = (
+    _HDMI_YAMLS_PREFIX + "axi_dispctrl.yaml",
+    _HDMI_YAMLS_PREFIX + "clock_crossing.yaml",
+    _HDMI_YAMLS_PREFIX + "dma_axi_in_axis_out.yaml",
+    _HDMI_YAMLS_PREFIX + "hdmi_tx.yaml",
+    _HDMI_YAMLS_PREFIX + "litex_mmcm.yaml",
+    _HDMI_YAMLS_PREFIX + "proc_sys_reset.yaml",
+    _HDMI_YAMLS_PREFIX + "ps7.yaml",
+    _AXI_YAMLS_PREFIX + "axi_axil_adapter.yaml",
+    _AXI_YAMLS_PREFIX + "axi_interconnect.yaml",
+    _AXI_YAMLS_PREFIX + "axi_protocol_converter.yaml",
+    _AXI_YAMLS_PREFIX + "axis_dwidth_converter.yaml",
+    _AXI_YAMLS_PREFIX + "axis_async_fifo.yaml",
+)
+
+_HIERARCHY_IPCORES_YAMLS = (
+    _HIERARCHY_YAMLS_PREFIX + "c_mod_1/c_mod_1.yaml",
+    _HIERARCHY_YAMLS_PREFIX + "c_mod_2/c_mod_2.yaml",
+    _HIERARCHY_YAMLS_PREFIX + "c_mod_3/c_mod_3.yaml",
+    _HIERARCHY_YAMLS_PREFIX + "s1_mod_1/s1_mod_1.yaml",
+    _HIERARCHY_YAMLS_PREFIX + "s1_mod_2/s1_mod_2.yaml",
+    _HIERARCHY_YAMLS_PREFIX + "s1_mod_3/s1_mod_3.yaml",
+    _HIERARCHY_YAMLS_PREFIX + "s2_mod_1/s2_mod_1.yaml",
+    _HIERARCHY_YAMLS_PREFIX + "s2_mod_2/s2_mod_2.yaml",
+)
+
 
 def pwm_ipcores_yamls_data() -> List[str]:
-    _pwm_yamls_prefix = "examples/pwm/ipcores/"
-    return [
-        "topwrap/ips/axi/axi_axil_adapter.yaml",
-        _pwm_yamls_prefix + "ps7.yaml",
-        _pwm_yamls_prefix + "litex_pwm.yml",
-    ]
+    return list(_PWM_IPCORES_YAMLS)
 
 
 @pytest.fixture
@@ -28,22 +62,7 @@ def pwm_ipcores_yamls() -> List[str]:
 
 
 def hdmi_ipcores_yamls_data() -> List[str]:
-    _hdmi_yamls_prefix = "examples/hdmi/ipcores/"
-    _axi_yamls_prefix = "topwrap/ips/axi/"
-    return [
-        _hdmi_yamls_prefix + "axi_dispctrl.yaml",
-        _hdmi_yamls_prefix + "clock_crossing.yaml",
-        _hdmi_yamls_prefix + "dma_axi_in_axis_out.yaml",
-        _hdmi_yamls_prefix + "hdmi_tx.yaml",
-        _hdmi_yamls_prefix + "litex_mmcm.yaml",
-        _hdmi_yamls_prefix + "proc_sys_reset.yaml",
-        _hdmi_yamls_prefix + "ps7.yaml",
-        _axi_yamls_prefix + "axi_axil_adapter.yaml",
-        _axi_yamls_prefix + "axi_interconnect.yaml",
-        _axi_yamls_prefix + "axi_protocol_converter.yaml",
-        _axi_yamls_prefix + "axis_dwidth_converter.yaml",
-        _axi_yamls_prefix + "axis_async_fifo.yaml",
-    ]
+    return list(_HDMI_IPCORES_YAMLS)
 
 
 @pytest.fixture
@@ -52,17 +71,7 @@ def hdmi_ipcores_yamls() -> List[str]:
 
 
 def hierarchy_ipcores_yamls_data() -> List[str]:
-    _hierarchy_yamls_prefix = "examples/hierarchy/repo/cores/"
-    return [
-        _hierarchy_yamls_prefix + "c_mod_1/c_mod_1.yaml",
-        _hierarchy_yamls_prefix + "c_mod_2/c_mod_2.yaml",
-        _hierarchy_yamls_prefix + "c_mod_3/c_mod_3.yaml",
-        _hierarchy_yamls_prefix + "s1_mod_1/s1_mod_1.yaml",
-        _hierarchy_yamls_prefix + "s1_mod_2/s1_mod_2.yaml",
-        _hierarchy_yamls_prefix + "s1_mod_3/s1_mod_3.yaml",
-        _hierarchy_yamls_prefix + "s2_mod_1/s2_mod_1.yaml",
-        _hierarchy_yamls_prefix + "s2_mod_2/s2_mod_2.yaml",
-    ]
+    return list(_HIERARCHY_IPCORES_YAMLS)
 
 
 @pytest.fixture
@@ -94,12 +103,12 @@ def test_dirs_data() -> Dict[str, Path]:
     return paths
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_dirs() -> Dict[str, Path]:
     return test_dirs_data()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def all_specification_files(test_dirs: Dict[str, Path]) -> Dict[str, JsonType]:
     return {
         ip_name: read_json_file(dir / f"specification_{ip_name}.json")
@@ -107,6 +116,8 @@ def all_specification_files(test_dirs: Dict[str, Path]) -> Dict[str, JsonType]:
     }
 
 
+# deliberately function-scoped: parsing a dataflow may rename its nodes
+# in place, so tests must not share one dict
 @pytest.fixture
 def all_dataflow_files(test_dirs: Dict[str, Path]) -> Dict[str, JsonType]:
     return {
@@ -115,7 +126,7 @@ def all_dataflow_files(test_dirs: Dict[str, Path]) -> Dict[str, JsonType]:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def all_designs(test_dirs: Dict[str, Path]) -> Dict[str, DesignDescription]:
     return {
         ip_name: DesignDescription.load(dir / f"project_{ip_name}.yml")
@@ -123,7 +134,7 @@ def all_designs(test_dirs: Dict[str, Path]) -> Dict[str, DesignDescription]:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def all_encoded_design_files(all_designs: Dict[str, DesignDescription]) -> Dict[str, str]:
     return {
         test_name: b64encode(design.to_yaml().encode("utf-8")).decode("utf-8")
@@ -25,7 +25,7 @@ import marshmallow_dataclass
 import yaml
 from typing_extensions import Self
 
-from topwrap.util import MISSING, MaybeMissing
+from topwrap.util import MISSING, MaybeMissing, load_yaml
 
 
 class RegexpField(marshmallow.fields.Field):
@@ -381,7 +381,7 @@ class MarshmallowDataclassExtensions:
 
     @classmethod
     def from_yaml(cls, yaml_str: str, **kwargs: Any) -> Self:
-        return cls.from_dict(yaml.safe_load(yaml_str, **kwargs))
+        return cls.from_dict(load_yaml(yaml_str, **kwargs))
 
     def save(self, path: Union[str, Path], **kwargs: Any):
         with open(path, "w") as f:
@@ -390,4 +390,4 @@ class MarshmallowDataclassExtensions:
     @classmethod
     def load(cls, path: Union[str, Path], **kwargs: Any) -> Self:
         with open(path) as f:
-            return cls.from_dict(yaml.safe_load(f, **kwargs))
+            return cls.from_dict(load_yaml(f, **kwargs))
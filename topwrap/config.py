@@ -12,6 +12,7 @@ import yaml
 
 from topwrap.common_serdes import MarshmallowDataclassExtensions, ext_field
 from topwrap.repo.user_repo import UserRepo
+from topwrap.util import load_yaml
 
 logger = logging.getLogger(__name__)
 
@@ -104,7 +105,7 @@ class ConfigManager:
 
             with open(path) as f:
                 try:
-                    yaml_dict = yaml.safe_load(f)
+                    yaml_dict = load_yaml(f)
                 except yaml.YAMLError:
                     logger.warning(f"{path} configuration file is not a valid YAML")
                     continue
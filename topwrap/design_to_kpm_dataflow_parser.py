@@ -293,10 +293,10 @@ class KPMDataflowGraph:
 
 def _get_specification_node_by_type(type: str, specification: dict) -> Optional[dict]:
     """Return a node of type `type` from specification"""
-    for node in specification["nodes"]:
-        if type == node["layer"]:
-            return node
-    logging.warning(f'Node type "{type}" not found in specification')
+    node = next((node for node in specification["nodes"] if type == node["layer"]), None)
+    if node is None:
+        logging.warning(f'Node type "{type}" not found in specification')
+    return node
 
 
 def _ipcore_param_to_kpm_value(param: IPCoreParameter) -> str:
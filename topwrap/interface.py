@@ -7,10 +7,9 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 import marshmallow_dataclass
-import yaml
 from importlib_resources import as_file, files
 
-from topwrap.util import recursive_defaultdict
+from topwrap.util import load_yaml, recursive_defaultdict
 
 from .common_serdes import (
     MarshmallowDataclassExtensions,
@@ -103,7 +102,7 @@ def load_interface_definitions(dir_name: Optional[Path] = None):
         for path in dir_name.glob("**/*"):
             if path.suffix.lower() in (".yaml", ".yml"):
                 with open(path) as f:
-                    defs.append(yaml.safe_load(f))
+                    defs.append(load_yaml(f))
     return defs
 
 
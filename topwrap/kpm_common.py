@@ -2,10 +2,10 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Tuple
 
 from topwrap.hdl_parsers_utils import PortDirection
 from topwrap.util import UnreachableError
@@ -22,6 +22,8 @@ SUBGRAPH_NODE = "subgraph"
 EXPOSED_IFACE = "externalName"
 METANODE_CATEGORY = "Metanode"
 
+_EXTERNAL_METANODE_NAMES = frozenset((EXT_INPUT_NAME, EXT_OUTPUT_NAME, EXT_INOUT_NAME))
+
 
 @dataclass
 class InterfaceFromConnection:
@@ -29,42 +31,44 @@ class InterfaceFromConnection:
     connection_id: str
 
 
-@dataclass
-class InterfaceData:
+class InterfaceData(NamedTuple):
+    """A lightweight record describing a single node interface.
+
+    A NamedTuple rather than a dataclass since dataflows can contain
+    thousands of interfaces - tuples have a much smaller per-object
+    footprint and C-level field access.
+    """
+
     node_name: str
     iface_name: str
     iface_direction: str
 
 
 def get_all_graph_nodes(dataflow_json: JsonType) -> List[JsonType]:
-    return _get_all_graph_values(dataflow_json, "nodes")
+    return list(iter_all_graph_nodes(dataflow_json))
 
 
 def get_all_graph_connections(dataflow_json: JsonType) -> List[JsonType]:
-    return _get_all_graph_values(dataflow_json, "connections")
+    return list(iter_all_graph_connections(dataflow_json))
 
 
-def _get_all_graph_values(dataflow_json: JsonType, value: str) -> List[JsonType]:
-    """Return given value from all graphs. Example use: value="nodes" will return all nodes from all graphs"""
-    all_values = []
-    for graph in dataflow_json["graphs"]:
-        all_values += graph[value]
-    return all_values
+def iter_all_graph_nodes(dataflow_json: JsonType) -> Iterator[JsonType]:
+    return _iter_all_graph_values(dataflow_json, "nodes")
 
 
-def _get_graph_with_conn_id(dataflow_json: JsonType, conn_id: str) -> Optional[JsonType]:
-    """Returns graph that has connections with given id"""
+def iter_all_graph_connections(dataflow_json: JsonType) -> Iterator[JsonType]:
+    return _iter_all_graph_values(dataflow_json, "connections")
+
+
+def _iter_all_graph_values(dataflow_json: JsonType, value: str) -> Iterator[JsonType]:
+    """Yield given value from all graphs lazily. Example use: value="nodes" will yield all nodes from all graphs"""
     for graph in dataflow_json["graphs"]:
-        for conn in graph["connections"]:
-            if conn["id"] == conn_id:
-                return graph
+        yield from graph[value]
 
 
 def get_graph_with_id(dataflow_json: JsonType, graph_id: str) -> Optional[JsonType]:
     """Returns graph with given id"""
-    for graph in dataflow_json["graphs"]:
-        if graph["id"] == graph_id:
-            return graph
+    return next((graph for graph in dataflow_json["graphs"] if graph["id"] == graph_id), None)
 
 
 def get_entry_graph(dataflow_json: JsonType) -> JsonType:
@@ -104,7 +108,7 @@ class RPCparams:
 
 def is_external_metanode(node: JsonType) -> bool:
     """Return True if a node is an external metanode, False otherwise."""
-    return node["name"] in [EXT_INPUT_NAME, EXT_OUTPUT_NAME, EXT_INOUT_NAME]
+    return node["name"] in _EXTERNAL_METANODE_NAMES
 
 
 def is_constant_metanode(node: JsonType) -> bool:
@@ -169,39 +173,61 @@ def get_unexposed_subgraph_meta_iface(subgraph_metanode: JsonType) -> JsonType:
     return _get_subgraph_metanode_iface(subgraph_metanode, False)
 
 
+def iter_dataflow_ip_nodes(dataflow_json: JsonType) -> Iterator[JsonType]:
+    """Yield nodes which represent ip cores lazily, without building the
+    per-dataflow cache. Preferred over `get_dataflow_ip_nodes` for one-shot
+    iteration"""
+    for node in iter_all_graph_nodes(dataflow_json):
+        if not is_metanode(node) and not is_subgraph_node(node):
+            yield node
+
+
+def iter_dataflow_external_metanodes(dataflow_json: JsonType) -> Iterator[JsonType]:
+    """Yield external metanodes lazily, without building the per-dataflow cache"""
+    for node in iter_all_graph_nodes(dataflow_json):
+        if is_external_metanode(node):
+            yield node
+
+
+def iter_dataflow_constant_metanodes(dataflow_json: JsonType) -> Iterator[JsonType]:
+    """Yield constant metanodes lazily, without building the per-dataflow cache"""
+    for node in iter_all_graph_nodes(dataflow_json):
+        if is_constant_metanode(node):
+            yield node
+
+
 def get_dataflow_subgraph_metanodes(dataflow_json: JsonType) -> List[JsonType]:
     """Return a list of subgraph metanodes"""
-    subgraph_metanodes = []
-    for node in get_all_graph_nodes(dataflow_json):
-        if is_subgraph_metanode(node):
-            subgraph_metanodes.append(node)
-    return subgraph_metanodes
+    return index_dataflow(dataflow_json).subgraph_metanodes
 
 
 def get_dataflow_ip_nodes(dataflow_json: JsonType) -> List[JsonType]:
     """Return a list of nodes which represent ip cores
     (i.e. filter out External Outputs, Inputs and Inouts)
     """
-    ip_nodes = []
-    for node in get_all_graph_nodes(dataflow_json):
-        if not is_metanode(node) and not is_subgraph_node(node):
-            ip_nodes.append(node)
-    return ip_nodes
+    return index_dataflow(dataflow_json).ip_nodes
 
 
 def get_dataflow_subgraph_nodes(dataflow_json: JsonType) -> List[JsonType]:
     """Return subgraph nodes from every graph. Subgraph node is a node that has "subgraph" field"""
-    return [node for node in get_all_graph_nodes(dataflow_json) if is_subgraph_node(node)]
+    return index_dataflow(dataflow_json).subgraph_nodes
 
 
 def get_dataflow_external_metanodes(dataflow_json: JsonType) -> List[JsonType]:
     """Return a list of external metanodes (i.e. External Outputs and Inputs)"""
-    return [node for node in get_all_graph_nodes(dataflow_json) if is_external_metanode(node)]
+    return index_dataflow(dataflow_json).external_metanodes
 
 
 def get_dataflow_constant_metanodes(dataflow_json: JsonType) -> List[JsonType]:
     """Return a list of constant metanodes"""
-    return [node for node in get_all_graph_nodes(dataflow_json) if is_constant_metanode(node)]
+    return index_dataflow(dataflow_json).constant_metanodes
+
+
+def _get_interface_ids(nodes: List[JsonType]) -> FrozenSet[str]:
+    """Return ids of all the interfaces belonging to given nodes.
+    Unlike `_get_interfaces` this doesn't build any per-interface records,
+    so it's the preferred form when only the ids are needed"""
+    return frozenset(iface["id"] for node in nodes for iface in node["interfaces"])
 
 
 def _get_interfaces(nodes: List[JsonType]) -> Dict[str, List[InterfaceData]]:
@@ -209,21 +235,160 @@ def _get_interfaces(nodes: List[JsonType]) -> Dict[str, List[InterfaceData]]:
     The resulting dict consists of items:
     {"iface_id": [InterfaceData]}
     There can be multiple interfaces with given id"""
-    result = defaultdict(list)
+    result: Dict[str, List[InterfaceData]] = defaultdict(list)
+    # local bindings avoid repeated global and attribute lookups in this
+    # double loop, which runs once per interface of every node
+    get_bucket = result.__getitem__
+    rec = InterfaceData
     for node in nodes:
+        node_name = node["instanceName"]
         for interface in node["interfaces"]:
-            result[interface["id"]].append(
-                InterfaceData(node["instanceName"], interface["name"], interface["direction"])
+            get_bucket(interface["id"]).append(
+                rec(node_name, interface["name"], interface["direction"])
             )
     return result
 
 
+class KPMDataflowIndex:
+    """All the lookup structures derived from one dataflow JSON, built with
+    a single pass over its nodes and a single pass over its connections.
+
+    Memoized per document by `index_dataflow`, so the `get_dataflow_*` and
+    `find_dataflow_*` helpers don't re-scan the dataflow on every call.
+    """
+
+    __slots__ = (
+        "dataflow",
+        "ip_nodes",
+        "subgraph_nodes",
+        "external_metanodes",
+        "constant_metanodes",
+        "subgraph_metanodes",
+        "ip_interfaces",
+        "external_interfaces",
+        "ip_iface_ids",
+        "external_iface_ids",
+        "graph_interfaces_by_conn_id",
+        "ip_connections",
+        "external_connections",
+        "node_by_iface_name_id",
+    )
+
+    def __init__(self, dataflow_json: JsonType):
+        # a strong reference to the source dataflow - it pins the dict in
+        # memory so that its id() cannot be reused while the index is cached
+        self.dataflow = dataflow_json
+        self.ip_nodes: List[JsonType] = []
+        self.subgraph_nodes: List[JsonType] = []
+        self.external_metanodes: List[JsonType] = []
+        self.constant_metanodes: List[JsonType] = []
+        self.subgraph_metanodes: List[JsonType] = []
+        self.ip_interfaces: Dict[str, List[InterfaceData]] = defaultdict(list)
+        self.external_interfaces: Dict[str, List[InterfaceData]] = defaultdict(list)
+        # connection id -> interfaces of the graph containing that connection
+        self.graph_interfaces_by_conn_id: Dict[str, Dict[str, List[InterfaceData]]] = {}
+        self.ip_connections: List[JsonType] = []
+        self.external_connections: List[JsonType] = []
+        # (iface_name, iface_id) -> first node having such an interface
+        self.node_by_iface_name_id: Dict[Tuple[str, str], JsonType] = {}
+
+        graphs_interfaces = []
+        for graph in dataflow_json["graphs"]:
+            graph_interfaces: Dict[str, List[InterfaceData]] = defaultdict(list)
+            graphs_interfaces.append((graph, graph_interfaces))
+            for node in graph["nodes"]:
+                # the metanode predicates are inlined here as name checks to
+                # avoid three function calls per node on this hot path
+                name = node["name"]
+                is_external = name in _EXTERNAL_METANODE_NAMES
+                is_meta = True
+                if is_external:
+                    self.external_metanodes.append(node)
+                elif name == CONST_NAME:
+                    self.constant_metanodes.append(node)
+                elif name == SUBGRAPH_METANODE:
+                    self.subgraph_metanodes.append(node)
+                else:
+                    is_meta = False
+                is_ip = False
+                if SUBGRAPH_NODE in node:
+                    self.subgraph_nodes.append(node)
+                elif not is_meta:
+                    is_ip = True
+                    self.ip_nodes.append(node)
+
+                node_name = node["instanceName"]
+                category_interfaces = (
+                    self.ip_interfaces
+                    if is_ip
+                    else self.external_interfaces
+                    if is_external
+                    else None
+                )
+                for interface in node["interfaces"]:
+                    rec = InterfaceData(node_name, interface["name"], interface["direction"])
+                    graph_interfaces[interface["id"]].append(rec)
+                    # setdefault keeps the first matching node, like the
+                    # linear scan this index replaces
+                    self.node_by_iface_name_id.setdefault(
+                        (interface["name"], interface["id"]), node
+                    )
+                    if category_interfaces is not None:
+                        category_interfaces[interface["id"]].append(rec)
+
+        self.ip_iface_ids: FrozenSet[str] = frozenset(self.ip_interfaces)
+        self.external_iface_ids: FrozenSet[str] = frozenset(self.external_interfaces)
+
+        # the connection pass both maps connections to their graph's
+        # interfaces and classifies them as ip-to-ip or external
+        for graph, graph_interfaces in graphs_interfaces:
+            for conn in graph["connections"]:
+                # setdefault keeps the first graph containing the id, like
+                # the linear scan this index replaces
+                self.graph_interfaces_by_conn_id.setdefault(conn["id"], graph_interfaces)
+                if conn["from"] in self.ip_iface_ids and conn["to"] in self.ip_iface_ids:
+                    self.ip_connections.append(conn)
+                if conn["from"] in self.external_iface_ids or conn["to"] in self.external_iface_ids:
+                    self.external_connections.append(conn)
+
+
+_DATAFLOW_CACHE_MAX_ENTRIES = 8
+_dataflow_index_cache: "OrderedDict[int, KPMDataflowIndex]" = OrderedDict()
+
+
+def clear_dataflow_caches() -> None:
+    """Drop all memoized per-dataflow data.
+
+    Must be called after modifying a dataflow or specification in-place
+    (e.g. renaming nodes), otherwise the helpers in this module may return
+    stale results.
+    """
+    _dataflow_index_cache.clear()
+    _spec_iface_cache.clear()
+
+
+def index_dataflow(dataflow_json: JsonType) -> KPMDataflowIndex:
+    """Return the memoized `KPMDataflowIndex` of `dataflow_json`, building
+    it once per document on first access"""
+    key = id(dataflow_json)
+    index = _dataflow_index_cache.get(key)
+    if index is not None and index.dataflow is dataflow_json:
+        _dataflow_index_cache.move_to_end(key)
+        return index
+
+    index = KPMDataflowIndex(dataflow_json)
+    _dataflow_index_cache[key] = index
+    while len(_dataflow_index_cache) > _DATAFLOW_CACHE_MAX_ENTRIES:
+        _dataflow_index_cache.popitem(last=False)
+    return index
+
+
 def get_dataflow_ips_interfaces(dataflow_json: JsonType) -> Dict[str, List[InterfaceData]]:
     """Return a dict of all the interfaces of all the nodes representing ip cores.
     The resulting dict consists of items:
     {"iface_id": [InterfaceData]}"""
 
-    return _get_interfaces(get_dataflow_ip_nodes(dataflow_json))
+    return index_dataflow(dataflow_json).ip_interfaces
 
 
 def get_dataflow_subgraph_interfaces(dataflow_json: JsonType) -> Dict[str, List[InterfaceData]]:
@@ -236,31 +401,40 @@ def get_dataflow_subgraph_interfaces(dataflow_json: JsonType) -> Dict[str, List[
 
 def get_dataflow_subgraph_connections(dataflow_json: JsonType) -> List[JsonType]:
     """Return connections that are related to subgraph metanodes"""
-    ifaces_ids = get_dataflow_subgraph_interfaces(dataflow_json).keys()
+    ifaces_ids = _get_interface_ids(get_dataflow_subgraph_metanodes(dataflow_json))
     subgraph_connections = []
-    for conn in get_all_graph_connections(dataflow_json):
+    for conn in iter_all_graph_connections(dataflow_json):
         if conn["from"] in ifaces_ids and conn["to"] in ifaces_ids:
             subgraph_connections.append(conn)
     return subgraph_connections
 
 
+def classify_connections(dataflow_json: JsonType) -> Tuple[List[JsonType], List[JsonType]]:
+    """Return `(ip_connections, external_connections)` of the dataflow,
+    classified in a single pass over all connections"""
+    index = index_dataflow(dataflow_json)
+    return (index.ip_connections, index.external_connections)
+
+
 def get_dataflow_ip_connections(dataflow_json: JsonType) -> List[JsonType]:
     """Return connections between two IP cores
     (e.g. filter out connections to external metanodes)
     """
-    ifaces_ids = get_dataflow_ips_interfaces(dataflow_json).keys()
-    graph_ip_connections = []
-    for conn in get_all_graph_connections(dataflow_json):
-        if conn["from"] in ifaces_ids and conn["to"] in ifaces_ids:
-            graph_ip_connections.append(conn)
-    return graph_ip_connections
+    return index_dataflow(dataflow_json).ip_connections
 
 
 def get_dataflow_external_interfaces(dataflow_json: JsonType) -> Dict[str, List[InterfaceData]]:
     """Return a dict of all the interfaces of all the external metanodes.
     The resulting dict consists of items
     {"iface_id": [InterfaceData]}"""
-    return _get_interfaces(get_dataflow_external_metanodes(dataflow_json))
+    return index_dataflow(dataflow_json).external_interfaces
+
+
+def get_dataflow_external_interface_ids(dataflow_json: JsonType) -> FrozenSet[str]:
+    """Return ids of all the interfaces of all the external metanodes.
+    Cheaper than taking the keys of `get_dataflow_external_interfaces` when
+    only the ids are needed"""
+    return index_dataflow(dataflow_json).external_iface_ids
 
 
 def get_dataflow_constant_interfaces(dataflow_json: JsonType) -> Dict[str, List[InterfaceData]]:
@@ -271,11 +445,11 @@ def get_dataflow_constant_interfaces(dataflow_json: JsonType) -> Dict[str, List[
 
 
 def _get_ifaces_metanodes_connections(
-    dataflow_json: JsonType, ifaces_ids: List[str]
+    dataflow_json: JsonType, ifaces_ids: FrozenSet[str]
 ) -> List[JsonType]:
     """Return all connections in which one of the connection node id is in "ifaces_ids" """
     graph_connections = []
-    for conn in get_all_graph_connections(dataflow_json):
+    for conn in iter_all_graph_connections(dataflow_json):
         if conn["from"] in ifaces_ids or conn["to"] in ifaces_ids:
             graph_connections.append(conn)
     return graph_connections
@@ -285,16 +459,15 @@ def get_dataflow_external_connections(dataflow_json: JsonType) -> List[JsonType]
     """Return connections from/to metanodes representing
     external inputs/outputs
     """
-    ifaces_ids = get_dataflow_external_interfaces(dataflow_json).keys()
-    return _get_ifaces_metanodes_connections(dataflow_json, list(ifaces_ids))
+    return index_dataflow(dataflow_json).external_connections
 
 
 def get_dataflow_constant_connections(dataflow_json: JsonType) -> List[JsonType]:
     """Return connections from/to metanodes representing
     external inputs/outputs
     """
-    ifaces_ids = get_dataflow_constant_interfaces(dataflow_json).keys()
-    return _get_ifaces_metanodes_connections(dataflow_json, list(ifaces_ids))
+    ifaces_ids = _get_interface_ids(get_dataflow_constant_metanodes(dataflow_json))
+    return _get_ifaces_metanodes_connections(dataflow_json, ifaces_ids)
 
 
 def get_metanode_interface_id(metanode: JsonType) -> str:
@@ -334,21 +507,18 @@ def find_dataflow_node_by_interface_name_id(
     """Return dataflow node which has an `iface_name` interface.
     Note that there can be multiple interfaces with given id so finding node by interface id is not reliable
     """
-    for node in get_all_graph_nodes(dataflow_json):
-        for interface in node["interfaces"]:
-            if interface["name"] == iface_name and interface["id"] == iface_id:
-                return node
+    return index_dataflow(dataflow_json).node_by_iface_name_id.get((iface_name, iface_id))
 
 
 def find_dataflow_interface_by_id(
     dataflow_json: JsonType, iface_conn: InterfaceFromConnection
 ) -> Optional[InterfaceData]:
     """Return InterfaceData object that corresponds to a given 'iface_id'"""
-    graph_with_connection = _get_graph_with_conn_id(dataflow_json, iface_conn.connection_id)
-    if graph_with_connection is None:
+    graph_interfaces = index_dataflow(dataflow_json).graph_interfaces_by_conn_id.get(
+        iface_conn.connection_id
+    )
+    if graph_interfaces is None:
         raise ValueError(f"Graph with connection {iface_conn.connection_id} was not found")
-
-    graph_interfaces = _get_interfaces(graph_with_connection["nodes"])
     if iface_conn.iface_id in graph_interfaces.keys():
         if len(graph_interfaces[iface_conn.iface_id]) > 1:
             logging.warning(
@@ -357,16 +527,37 @@ def find_dataflow_interface_by_id(
         return graph_interfaces[iface_conn.iface_id][0]
 
 
+_spec_iface_cache: "OrderedDict[int, Tuple[JsonType, Dict[Tuple[str, str], JsonType]]]" = (
+    OrderedDict()
+)
+
+
+def _get_spec_iface_index(specification: JsonType) -> Dict[Tuple[str, str], JsonType]:
+    """Return a memoized {(node_layer, iface_name): iface} index of the
+    specification, building it once per document on first access"""
+    key = id(specification)
+    entry = _spec_iface_cache.get(key)
+    if entry is not None and entry[0] is specification:
+        _spec_iface_cache.move_to_end(key)
+        return entry[1]
+
+    index: Dict[Tuple[str, str], JsonType] = {}
+    for node in specification["nodes"]:
+        layer = node["layer"]
+        for interface in node["interfaces"]:
+            index.setdefault((layer, interface["name"]), interface)
+
+    _spec_iface_cache[key] = (specification, index)
+    while len(_spec_iface_cache) > _DATAFLOW_CACHE_MAX_ENTRIES:
+        _spec_iface_cache.popitem(last=False)
+    return index
+
+
 def find_spec_interface_by_name(
     specification: JsonType, node_type: str, iface_name: str
 ) -> Optional[JsonType]:
     """Find `name` interface of `ip_type` IP core in `specification`"""
-    for node in specification["nodes"]:
-        if node["layer"] != node_type:
-            continue
-        for interface in node["interfaces"]:
-            if interface["name"] == iface_name:
-                return interface
+    return _get_spec_iface_index(specification).get((node_type, iface_name))
 
 
 def find_connected_interfaces(
@@ -374,7 +565,7 @@ def find_connected_interfaces(
 ) -> List[InterfaceFromConnection]:
     """Return a list of InterfacefromConnection objects where 'iface_id' is referenced in a connection"""
     result = []
-    for conn in get_all_graph_connections(dataflow_json):
+    for conn in iter_all_graph_connections(dataflow_json):
         if conn["from"] == iface_id:
             result.append(InterfaceFromConnection(conn["to"], conn["id"]))
         elif conn["to"] == iface_id:
@@ -25,13 +25,13 @@ from .kpm_common import (
     EXT_OUTPUT_NAME,
     InterfaceData,
     InterfaceFromConnection,
+    clear_dataflow_caches,
     find_connected_interfaces,
     find_dataflow_interface_by_id,
     find_dataflow_node_by_interface_name_id,
     get_all_graph_connections,
     get_all_graph_nodes,
     get_dataflow_constant_connections,
-    get_dataflow_ip_nodes,
     get_entry_graph,
     get_exposed_subgraph_meta_iface,
     get_external_metanode_direction,
@@ -45,6 +45,7 @@ from .kpm_common import (
     is_metanode,
     is_subgraph_metanode,
     is_subgraph_node,
+    iter_dataflow_ip_nodes,
     kpm_direction_to_port_dir,
 )
 from .util import JsonType, UnreachableError
@@ -152,7 +153,7 @@ def _kpm_properties_to_parameters(properties: List[JsonType]) -> JsonType:
 
 def _kpm_nodes_to_parameters(dataflow_data: JsonType) -> JsonType:
     result = dict()
-    for node in get_dataflow_ip_nodes(dataflow_data):
+    for node in iter_dataflow_ip_nodes(dataflow_data):
         result[node["instanceName"]] = _kpm_properties_to_parameters(node["properties"])
     return result
 
@@ -164,7 +165,7 @@ def _kpm_nodes_to_ips(dataflow_data: JsonType, specification: JsonType) -> JsonT
     ips = {}
     filename = None
     instance_names = defaultdict(int)
-    for node in get_dataflow_ip_nodes(dataflow_data):
+    for node in iter_dataflow_ip_nodes(dataflow_data):
         for spec_node in specification["nodes"]:
             if spec_node["layer"] == node["name"]:
                 if "additionalData" not in spec_node:
@@ -179,6 +180,8 @@ def _kpm_nodes_to_ips(dataflow_data: JsonType, specification: JsonType) -> JsonT
         cnt = instance_names[node["instanceName"]] = instance_names[node["instanceName"]] + 1
         if cnt > 1:
             node["instanceName"] += f"_{cnt}"
+            # the rename above invalidates interface data memoized in kpm_common
+            clear_dataflow_caches()
         ips[node["instanceName"]] = {
             "file": filename,
         }
@@ -19,14 +19,14 @@ from .kpm_common import (
     find_spec_interface_by_name,
     get_all_graph_connections,
     get_all_graph_nodes,
-    get_dataflow_constant_metanodes,
-    get_dataflow_external_interfaces,
+    get_dataflow_external_interface_ids,
     get_dataflow_external_metanodes,
     get_dataflow_ip_connections,
-    get_dataflow_ip_nodes,
     get_dataflow_ips_interfaces,
     get_metanode_interface_id,
     get_metanode_property_value,
+    iter_dataflow_constant_metanodes,
+    iter_dataflow_ip_nodes,
 )
 
 
@@ -40,7 +40,7 @@ def _check_duplicate_ip_names(dataflow_data, specification) -> CheckResult:
 
     names_set = set()
     duplicates = set()
-    for node in get_dataflow_ip_nodes(dataflow_data):
+    for node in iter_dataflow_ip_nodes(dataflow_data):
         if node["instanceName"] in names_set:
             duplicates.add(node["instanceName"])
         else:
@@ -54,7 +54,7 @@ def _check_duplicate_ip_names(dataflow_data, specification) -> CheckResult:
 
 def _check_parameters_values(dataflow_data, specification) -> CheckResult:
     invalid_params = list()
-    for node in get_dataflow_ip_nodes(dataflow_data):
+    for node in iter_dataflow_ip_nodes(dataflow_data):
         evaluated = dict()
         for property in node["properties"]:
             param_name = property["name"]
@@ -69,7 +69,7 @@ def _check_parameters_values(dataflow_data, specification) -> CheckResult:
                 except (ValueError, KeyError, SyntaxError, OverflowError):
                     invalid_params.append(f"{node['name']}:{param_name}")
 
-    for node in get_dataflow_constant_metanodes(dataflow_data):
+    for node in iter_dataflow_constant_metanodes(dataflow_data):
         name = node["properties"][0]["name"]
         value = node["properties"][0]["value"]
 
@@ -107,7 +107,7 @@ def _check_unconnected_ports_interfaces(dataflow_data, specification) -> CheckRe
 
 def _check_ext_in_to_ext_out_connections(dataflow_data, specification) -> CheckResult:
     """Check for connections between external metanodes"""
-    ext_ifaces_ids = get_dataflow_external_interfaces(dataflow_data).keys()
+    ext_ifaces_ids = get_dataflow_external_interface_ids(dataflow_data)
 
     for conn in get_all_graph_connections(dataflow_data):
         if conn["from"] in ext_ifaces_ids and conn["to"] in ext_ifaces_ids:
@@ -120,7 +120,7 @@ def _check_ambigous_ports(dataflow_data, specification) -> CheckResult:
     """Check for ports which are connected to another ipcore port
     and to external metanode at the same time
     """
-    ext_ifaces_ids = get_dataflow_external_interfaces(dataflow_data).keys()
+    ext_ifaces_ids = get_dataflow_external_interface_ids(dataflow_data)
 
     ambig_ifaces = []
     for iface_id, iface in get_dataflow_ips_interfaces(dataflow_data).items():
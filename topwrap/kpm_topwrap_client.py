@@ -7,7 +7,6 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Optional, Tuple
 
-import yaml
 from pipeline_manager_backend_communication.communication_backend import (
     CommunicationBackend,
 )
@@ -19,6 +18,7 @@ from .design_to_kpm_dataflow_parser import kpm_dataflow_from_design_descr
 from .kpm_common import RPCparams
 from .kpm_dataflow_parser import kpm_dataflow_to_design
 from .kpm_dataflow_validator import validate_kpm_design
+from .util import load_yaml
 from .yamls_to_kpm_spec_parser import ipcore_yamls_to_kpm_spec
 
 
@@ -109,7 +109,7 @@ def _kpm_specification_handler(yamlfiles: List[str]) -> dict:
 
 def _kpm_import_handler(data: str, yamlfiles: List[str]) -> dict:
     specification = ipcore_yamls_to_kpm_spec(yamlfiles)
-    design_descr = DesignDescription.from_dict(yaml.safe_load(data))
+    design_descr = DesignDescription.from_dict(load_yaml(data))
     return kpm_dataflow_from_design_descr(design_descr, specification)
 
 
@@ -2,13 +2,13 @@ import logging
 from dataclasses import dataclass
 from typing import Dict, List, Set
 
-import yaml
 from typing_extensions import override
 
 from topwrap.interface_grouper import standard_iface_grouper
 from topwrap.repo.files import File, TemporaryFile
 from topwrap.repo.resource import FileHandler, Resource
 from topwrap.repo.user_repo import Core, InterfaceDescription
+from topwrap.util import load_yaml
 from topwrap.verilog_parser import VerilogModule, VerilogModuleGenerator
 
 logger = logging.getLogger(__name__)
@@ -73,7 +73,7 @@ class InterfaceFileHandler(FileHandler):
         resources: List[Resource] = []
         for f in self._files:
             with open(f.path) as fd:
-                data = yaml.safe_load(fd)
+                data = load_yaml(fd)
             name = data["name"]
             iface_desc = InterfaceDescription(name, f)
             resources.append(iface_desc)
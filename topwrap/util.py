@@ -4,9 +4,26 @@
 from collections import defaultdict
 from typing import Any, DefaultDict, Dict, TypeVar, Union
 
+import yaml
+
+try:
+    # the libyaml-backed loader is several times faster than the pure-Python one
+    from yaml import CSafeLoader as _YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlSafeLoader
+
 JsonType = Dict[str, Any]
 
 
+def load_yaml(stream: Any, **kwargs: Any) -> Any:
+    """Parse a YAML document like `yaml.safe_load`, preferring the faster
+    libyaml-backed loader whenever it is available
+
+    :param stream: a string or an open file to parse
+    """
+    return yaml.load(stream, Loader=_YamlSafeLoader, **kwargs)
+
+
 def removeprefix(s: str, prefix: str) -> str:
     """Returns string with a prefix removed if it contains it
 
@@ -3,8 +3,9 @@
 
 import logging
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import PurePath
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from pipeline_manager.specification_builder import SpecificationBuilder
 
@@ -314,10 +315,22 @@ def new_spec_builder(yamlfiles: List[str]) -> dict:
     return specification_builder._construct_specification(sort_spec=False)
 
 
+@lru_cache(maxsize=16)
+def _ipcore_yamls_to_kpm_spec_cached(yamlfiles: Tuple[str, ...]) -> dict:
+    specification = new_spec_builder(list(yamlfiles))
+
+    _duplicate_ipcore_types_check(specification)
+
+    return specification
+
+
 def ipcore_yamls_to_kpm_spec(yamlfiles: List[str]) -> dict:
     """Translate Topwrap's IP core description YAMLs into
     KPM specification 'nodes'.
 
+    The result is memoized per set of input files, so e.g. consecutive RPC
+    requests of the KPM client don't re-parse all the YAMLs every time.
+
     :param yamlfiles: IP core description YAMLs, that will be converted
     into KPM specification 'nodes'
 
@@ -325,8 +338,4 @@ def ipcore_yamls_to_kpm_spec(yamlfiles: List[str]) -> dict:
         represents a separate IP core
     """
 
-    specification = new_spec_builder(yamlfiles)
-
-    _duplicate_ipcore_types_check(specification)
-
-    return specification
+    return _ipcore_yamls_to_kpm_spec_cached(tuple(yamlfiles))